@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 
 import argparse
+import json
 import os
+import re
 from pathlib import Path
-from tomlkit import parse, dumps
 
 TOML_PATH = Path("contracts/deployment.toml")
 CHAIN_KEY = os.environ.get("CHAIN_KEY", "anvil")
@@ -45,44 +46,35 @@ parser.add_argument("--povw-mint-deployment-commit", help="PoVW mint deployment
 parser.add_argument("--zkc", help="ZKC contract address")
 parser.add_argument("--vezkc", help="veZKC contract address")
 
+# Output options
+parser.add_argument(
+    "--discard-comments",
+    action="store_true",
+    help="Parse with tomllib and write with tomli_w; faster, but drops comments and formatting",
+)
+
 args = parser.parse_args()
 
-# Map CLI args to TOML field keys
-field_mapping = {
-    "admin": args.admin,
-    "admin-2": getattr(args, 'admin_2'),
-    "verifier": args.verifier,
-    "set-verifier": args.set_verifier,
-    "boundless-market": args.boundless_market,
-    "boundless-market-impl": args.boundless_market_impl,
-    "boundless-market-old-impl": args.boundless_market_old_impl,
-    "collateral-token": args.collateral_token,
-    "assessor-image-id": args.assessor_image_id,
-    "assessor-guest-url": args.assessor_guest_url,
-    # PoVW contract fields
-    "povw-accounting": args.povw_accounting,
-    "povw-accounting-impl": args.povw_accounting_impl,
-    "povw-accounting-old-impl": args.povw_accounting_old_impl,
-    "povw-accounting-admin": args.povw_accounting_admin,
-    "povw-mint": args.povw_mint,
-    "povw-mint-impl": args.povw_mint_impl,
-    "povw-mint-old-impl": args.povw_mint_old_impl,
-    "povw-mint-admin": args.povw_mint_admin,
-    # PoVW image ID fields
-    "povw-log-updater-id": args.povw_log_updater_id,
-    "povw-mint-calculator-id": args.povw_mint_calculator_id,
-    # Deployment commit fields
-    "boundless-market-deployment-commit": args.boundless_market_deployment_commit,
-    "povw-accounting-deployment-commit": args.povw_accounting_deployment_commit,
-    "povw-mint-deployment-commit": args.povw_mint_deployment_commit,
-    # ZKC contract fields
-    "zkc": args.zkc,
-    "vezkc": args.vezkc,
+# Map CLI args to TOML field keys (dest "set_verifier" -> key "set-verifier"),
+# keeping only explicitly provided values with surrounding whitespace stripped
+NON_FIELD_ARGS = {"discard_comments"}
+provided = {
+    key.replace("_", "-"): value.strip() if isinstance(value, str) else value
+    for key, value in vars(args).items()
+    if value is not None and key not in NON_FIELD_ARGS
 }
 
 # Load TOML file
 content = TOML_PATH.read_text()
-doc = parse(content)
+if args.discard_comments:
+    import tomllib
+    from tomli_w import dumps
+
+    doc = tomllib.loads(content)
+else:
+    from tomlkit import dumps, parse
+
+    doc = parse(content)
 
 # Access the relevant section
 try:
@@ -91,17 +83,18 @@ except KeyError:
     raise RuntimeError(f"[deployment.{CHAIN_KEY}] section not found in {TOML_PATH}")
 
 # Apply updates only for explicitly provided values
-for key, value in field_mapping.items():
-    if value is not None:
-        # Strip whitespace from the value
-        if isinstance(value, str):
-            value = value.strip()
-        section[key] = value
-        print(f"Updated '{key}' to '{value}' in [deployment.{CHAIN_KEY}]")
+for key, value in provided.items():
+    section[key] = value
+    print(f"Updated '{key}' to '{value}' in [deployment.{CHAIN_KEY}]")
 
 # Normalize output: no CRLF, strip trailing spaces, final newline
 output = dumps(doc)
-clean_output = "\n".join(line.rstrip() for line in output.splitlines()) + "\n"
+clean_output = re.sub(r"[ \t\r]+(?=\n|\Z)", "", output)
+if not clean_output.endswith("\n"):
+    clean_output += "\n"
 TOML_PATH.write_text(clean_output)
 
+# JSON sidecar so deployments-check.py can skip re-parsing the TOML
+TOML_PATH.with_suffix(".json").write_text(json.dumps(doc if args.discard_comments else doc.unwrap()))
+
 print(f"{TOML_PATH} updated successfully.")
\ No newline at end of file
@@ -1,49 +1,88 @@
+import json
 import tomllib
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List
 
 
-import re
-from typing import Dict
+FILES = {
+    'toml': 'contracts/deployment.toml',
+    'rs': 'crates/boundless-market/src/deployments.rs',
+    'zkc_rs': 'crates/zkc/src/deployments.rs',
+    'povw_rs': 'crates/povw/src/deployments.rs',
+    'docs': 'documentation/site/pages/developers/smart-contracts/deployments.mdx',
+}
 
-def extract_rs_addresses(rs_content: str, network: str) -> Dict[str, str]:
-    """
-    Parse a block like:
 
-    pub const MAINNET: Deployment = Deployment {
-        chain_id: Some(NamedChain::Mainnet as u64),
-        boundless_market_address: address!("0x..."),
-        verifier_router_address: Some(address!("0x...")),
-        set_verifier_address: address!("0x..."),
-        collateral_token_address: Some(address!("0x...")),
-    };
+# address!("0x..."), optionally wrapped in Some(...)
+_ADDR_RE = re.compile(r'address!\(\s*"(?P<addr>0x[a-fA-F0-9]{40})"\s*\)')
+
+# Docs table labels, keyed by the *_address field they populate
+_DOC_LABELS = {
+    'boundless_market_address': r'BoundlessMarket',
+    'set_verifier_address': r'SetVerifier',
+    'verifier_router_address': r'RiscZeroVerifierRouter',
+    'collateral_token_address': r'CollateralToken',
+    # Some sections may also list these:
+    'zkc_address': r'\bZKC\b',
+    'vezkc_address': r'\bveZKC\b',
+    'staking_rewards_address': r'StakingRewards',
+    'povw_accounting_address': r'\bPOVW_ACCOUNTING\b',
+    'povw_mint_address': r'\bPOVW_MINT\b',
+}
+# A "### <header>" line and its body, up to the next ###/#### header or end of file
+_DOC_SECTION_RE = re.compile(r'\n(### [^\n]+)\n(.*?)(?=\n###|\Z)', re.DOTALL)
+_DOC_LABEL_RES = {label: re.compile(rf'{label}.*?(0x[a-fA-F0-9]{{40}})') for label in _DOC_LABELS.values()}
 
-    Returns a dict mapping *_address field names to lowercase 0x addresses.
-    If a field is None or not present, returns '' for that key (or omits it if not present).
+
+# Any Deployment block, capturing the const name and its body.
+# Struct bodies never contain '}', so a negated class avoids lazy backtracking.
+_ANY_BLOCK_RE = re.compile(r'pub const (\w+)\s*:\s*Deployment\s*=\s*Deployment\s*\{([^}]*)\};')
+
+# Rust // and /* */ comments. A "https://..." string is cut too, but only non-address
+# fields such as order_stream_url contain one, and those are skipped anyway.
+_RS_COMMENT_RE = re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL)
+
+
+def _parse_rs_block(block: str) -> Dict[str, str]:
+    """
+    Extract the *_address fields from the body of one Deployment block.
+
+    Comments are dropped first; that also truncates string values containing "//",
+    which only matters for fields that are ignored here.
+
+    >>> _parse_rs_block('''
+    ...     // Market proxy, not the impl
+    ...     boundless_market_address: address!("0xAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA"), // see docs, too
+    ...     /* router: optional */ verifier_router_address: None,
+    ...     order_stream_url: Some(Cow::Borrowed("https://example.com")),
+    ... ''')
+    {'boundless_market_address': '0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', 'verifier_router_address': ''}
     """
-    # Grab the struct body for the requested network
-    block_pat = rf'pub const {re.escape(network.upper())}\s*:\s*Deployment\s*=\s*Deployment\s*\{{(.*?)\}};'
-    m = re.search(block_pat, rs_content, re.DOTALL)
     addresses: Dict[str, str] = {}
-    if not m:
-        return addresses
 
-    block = m.group(1)
+    # Drop comments so their text (and any commas in it) can't leak into field names
+    block = _RS_COMMENT_RE.sub('', block)
 
-    # Iterate over all "*_address: <value>," lines inside the block
-    for m_field in re.finditer(r'(\w+_address)\s*:\s*([^,]+),', block):
-        field = m_field.group(1)
-        val = m_field.group(2).strip()
+    # Iterate over all "*_address: <value>," fields inside the block
+    for part in block.split(','):
+        if '_address' not in part or ':' not in part:
+            continue
+        field, val = part.split(':', 1)
+        field = field.strip()
+        if not field.endswith('_address') or not field.isidentifier():
+            continue
+        val = val.strip()
 
         # None -> treat as empty
-        if re.fullmatch(r'None', val):
+        if val == 'None':
             addresses[field] = ''
             continue
 
         # Try to extract address inside address!("0x..."), optionally wrapped in Some(...)
-        m_addr = re.search(r'address!\(\s*"(?P<addr>0x[a-fA-F0-9]{40})"\s*\)', val)
+        m_addr = _ADDR_RE.search(val)
         if m_addr:
             addresses[field] = m_addr.group('addr').lower()
         else:
@@ -53,29 +92,44 @@ def extract_rs_addresses(rs_content: str, network: str) -> Dict[str, str]:
     return addresses
 
 
+def parse_all_rs(rs_content: str) -> Dict[str, Dict[str, str]]:
+    """
+    Parse every Deployment block in a single pass, e.g.:
 
-def extract_docs_addresses(docs_content: str, network_section: str) -> Dict[str, str]:
-    # Capture the section body until the next ### header or end of file
-    section_pattern = rf'{re.escape(network_section)}(.*?)(?:\n###|\Z)'
-    section_match = re.search(section_pattern, docs_content, re.DOTALL | re.IGNORECASE)
-    addresses: Dict[str, str] = {}
-    if section_match:
-        section = section_match.group(1)
+    pub const MAINNET: Deployment = Deployment {
+        chain_id: Some(NamedChain::Mainnet as u64),
+        boundless_market_address: address!("0x..."),
+        verifier_router_address: Some(address!("0x...")),
+        set_verifier_address: address!("0x..."),
+        collateral_token_address: Some(address!("0x...")),
+    };
+
+    Returns a dict mapping each const name (e.g. 'MAINNET') to a dict of *_address field
+    names to lowercase 0x addresses. Fields that are None become ''; absent fields are omitted.
+    """
+    return {m.group(1): _parse_rs_block(m.group(2)) for m in _ANY_BLOCK_RE.finditer(rs_content)}
 
+
+def parse_docs_sections(docs_content: str) -> Dict[str, str]:
+    """
+    Split the docs into a dict mapping each lowercased '### <header>' line to its body.
+    """
+    return {
+        m.group(1).strip().lower(): m.group(2)
+        for m in _DOC_SECTION_RE.finditer('\n' + docs_content)
+    }
+
+
+def extract_docs_addresses(sections: Dict[str, str], network_section: str) -> Dict[str, str]:
+    section = sections.get(network_section.lower())
+    addresses: Dict[str, str] = {}
+    if section is not None:
         def grab(label: str) -> str:
-            m = re.findall(rf'{label}.*?(0x[a-fA-F0-9]{{40}})', section)
-            return (m[0] if m else '').lower()
-
-        addresses['boundless_market_address'] = grab(r'BoundlessMarket')
-        addresses['set_verifier_address'] = grab(r'SetVerifier')
-        addresses['verifier_router_address'] = grab(r'RiscZeroVerifierRouter')
-        addresses['collateral_token_address'] = grab(r'CollateralToken')
-        # Some sections may also list these:
-        addresses['zkc_address'] = grab(r'\bZKC\b')
-        addresses['vezkc_address'] = grab(r'\bveZKC\b')
-        addresses['staking_rewards_address'] = grab(r'StakingRewards')
-        addresses['povw_accounting_address'] = grab(r'\bPOVW_ACCOUNTING\b')
-        addresses['povw_mint_address'] = grab(r'\bPOVW_MINT\b')
+            m = _DOC_LABEL_RES[label].search(section)
+            return (m.group(1) if m else '').lower()
+
+        for field, label in _DOC_LABELS.items():
+            addresses[field] = grab(label)
 
     return addresses
 
@@ -89,23 +143,77 @@ def toml_section(toml_data: dict, network_key: str) -> dict:
     return (toml_data.get('deployment') or {}).get(network_key, {}) or {}
 
 
+def check_pairs(
+    net_key: str,
+    toml_net: dict,
+    rs_addrs: Dict[str, str],
+    mapping: Dict[str, str],
+    rs_file: str,
+    msgs: List[str],
+) -> int:
+    """
+    Compare deployment.toml against one deployments.rs for a single network.
+
+    Appends a message to msgs for each missing or mismatched address and returns the number of errors.
+    """
+    errors = 0
+    for toml_field, addr_field in mapping.items():
+        toml_addr = (toml_net.get(toml_field) or '').lower()
+        rs_addr = rs_addrs.get(addr_field, '')
+
+        # Presence checks
+        if not toml_addr:
+            msgs.append(f"❌ Missing [deployment.{net_key}] {toml_field} in deployment.toml")
+            errors += 1
+        if not rs_addr:
+            msgs.append(f"❌ Missing [{net_key}] {addr_field} in {rs_file}")
+            errors += 1
+
+        # Mismatches
+        if toml_addr and rs_addr and toml_addr != rs_addr:
+            msgs.append(f"❌ Mismatch [{net_key}] {toml_field} between TOML and RS:")
+            msgs.append(f"  TOML: {toml_addr}")
+            msgs.append(f"  RS  : {rs_addr}")
+            errors += 1
+
+    return errors
+
+
 def main():
-    with open('contracts/deployment.toml', 'rb') as f:
-        toml_data = tomllib.load(f)
+    # Prefer the JSON sidecar written by update_deployment_toml.py, unless the TOML was edited since
+    toml_path = Path(FILES['toml'])
+    json_path = toml_path.with_suffix('.json')
+    use_json = json_path.exists() and json_path.stat().st_mtime >= toml_path.stat().st_mtime
+    files = dict(FILES, toml=json_path) if use_json else FILES
+
+    # Independent reads; issue them concurrently to overlap cold-cache I/O
+    with ThreadPoolExecutor(max_workers=len(files)) as ex:
+        # deployment.toml (or its JSON sidecar) is UTF-8 by spec, so read raw bytes rather than
+        # decoding with the locale's default encoding
+        futs = {
+            name: ex.submit(Path(path).read_bytes if name == 'toml' else Path(path).read_text)
+            for name, path in files.items()
+        }
+        contents = {name: fut.result() for name, fut in futs.items()}
 
-    rs_content = Path('crates/boundless-market/src/deployments.rs').read_text()
-    zkc_rs_content = Path('crates/zkc/src/deployments.rs').read_text()
-    povw_rs_content = Path('crates/povw/src/deployments.rs').read_text()
-    docs_content = Path('documentation/site/pages/developers/smart-contracts/deployments.mdx').read_text()
+    toml_text = contents['toml'].decode('utf-8')
+    toml_data = json.loads(toml_text) if use_json else tomllib.loads(toml_text)
+    rs_parsed = parse_all_rs(contents['rs'])
+    zkc_rs_parsed = parse_all_rs(contents['zkc_rs'])
+    povw_rs_parsed = parse_all_rs(contents['povw_rs'])
+    docs_content = contents['docs']
+    docs_sections = parse_docs_sections(docs_content)
 
     errors = 0
+    # Collected output, written in one go at the end
+    msgs: List[str] = []
 
     # Flag any TODOs in docs
     todos = check_todos(docs_content)
     if todos:
-        print("❌ Found TODO placeholders in documentation:")
+        msgs.append("❌ Found TODO placeholders in documentation:")
         for todo in todos:
-            print("  ", todo)
+            msgs.append(f"   {todo}")
         errors += len(todos)
 
     # Docs section headers
@@ -135,8 +243,8 @@ def main():
     # ---- Boundless Market + SetVerifier + Router + CollateralToken ----
     for net_key, docs_header in boundless_networks.items():
         toml_net = toml_section(toml_data, net_key)
-        rs_addrs = extract_rs_addresses(rs_content, boundless_rs_network_keys[net_key])
-        docs_addrs = extract_docs_addresses(docs_content, docs_header)
+        rs_addrs = rs_parsed.get(boundless_rs_network_keys[net_key], {})
+        docs_addrs = extract_docs_addresses(docs_sections, docs_header)
 
         mapping = {
             'boundless-market': 'boundless_market_address',
@@ -146,100 +254,75 @@ def main():
         }
 
         for toml_field, addr_field in mapping.items():
-            toml_addr = str(toml_net.get(toml_field, '') or '').lower()
-            rs_addr = str(rs_addrs.get(addr_field, '') or '').lower()
-            docs_addr = str(docs_addrs.get(addr_field, '') or '').lower()
+            toml_addr = (toml_net.get(toml_field) or '').lower()
+            rs_addr = rs_addrs.get(addr_field, '')
+            docs_addr = docs_addrs.get(addr_field, '')
 
             # Presence checks (each missing counts as an error)
             if not toml_addr:
-                print(f"❌ Missing [deployment.{net_key}] {toml_field} in deployment.toml")
+                msgs.append(f"❌ Missing [deployment.{net_key}] {toml_field} in deployment.toml")
                 errors += 1
             if not rs_addr:
-                print(f"❌ Missing [{net_key}] {addr_field} in crates/boundless-market/src/deployments.rs")
+                msgs.append(f"❌ Missing [{net_key}] {addr_field} in crates/boundless-market/src/deployments.rs")
                 errors += 1
             if not docs_addr:
-                print(f"❌ Missing [{net_key}] {addr_field} in documentation section '{docs_header}'")
+                msgs.append(f"❌ Missing [{net_key}] {addr_field} in documentation section '{docs_header}'")
                 errors += 1
 
             # Mismatch checks (only when both sides present)
             if toml_addr and rs_addr and toml_addr != rs_addr:
-                print(f"❌ Mismatch [{net_key}] {toml_field} between TOML and RS:")
-                print(f"  TOML: {toml_addr}")
-                print(f"  RS  : {rs_addr}")
+                msgs.append(f"❌ Mismatch [{net_key}] {toml_field} between TOML and RS:")
+                msgs.append(f"  TOML: {toml_addr}")
+                msgs.append(f"  RS  : {rs_addr}")
                 errors += 1
 
             if toml_addr and docs_addr and toml_addr != docs_addr:
-                print(f"❌ Mismatch [{net_key}] {toml_field} between TOML and documentation:")
-                print(f"  TOML: {toml_addr}")
-                print(f"  DOCS: {docs_addr}")
+                msgs.append(f"❌ Mismatch [{net_key}] {toml_field} between TOML and documentation:")
+                msgs.append(f"  TOML: {toml_addr}")
+                msgs.append(f"  DOCS: {docs_addr}")
                 errors += 1
 
     # ---- ZKC + veZKC (only on Ethereum networks) ----
-    for net_key, docs_header in zkc_networks.items():
-        toml_net = toml_section(toml_data, net_key)
-        rs_addrs = extract_rs_addresses(zkc_rs_content, zkc_rs_network_keys[net_key])
-
-        mapping = {
-            'zkc': 'zkc_address',
-            'vezkc': 'vezkc_address',
-            # TODO: add back once we update the deployment.toml
-            # 'zkc-staking-rewards': 'staking_rewards_address',
-        }
-
-        for toml_field, addr_field in mapping.items():
-            toml_addr = str(toml_net.get(toml_field, '') or '').lower()
-            rs_addr = str(rs_addrs.get(addr_field, '') or '').lower()
-
-            # Presence checks
-            if not toml_addr:
-                print(f"❌ Missing [deployment.{net_key}] {toml_field} in deployment.toml")
-                errors += 1
-            if not rs_addr:
-                print(f"❌ Missing [{net_key}] {addr_field} in crates/zkc/src/deployments.rs")
-                errors += 1
-
-            # Mismatches
-            if toml_addr and rs_addr and toml_addr != rs_addr:
-                print(f"❌ Mismatch [{net_key}] {toml_field} between TOML and RS:")
-                print(f"  TOML: {toml_addr}")
-                print(f"  RS  : {rs_addr}")
-                errors += 1
+    zkc_mapping = {
+        'zkc': 'zkc_address',
+        'vezkc': 'vezkc_address',
+        # TODO: add back once we update the deployment.toml
+        # 'zkc-staking-rewards': 'staking_rewards_address',
+    }
+    for net_key in zkc_networks:
+        errors += check_pairs(
+            net_key,
+            toml_section(toml_data, net_key),
+            zkc_rs_parsed.get(zkc_rs_network_keys[net_key], {}),
+            zkc_mapping,
+            'crates/zkc/src/deployments.rs',
+            msgs,
+        )
 
     # ---- POVW (only on Ethereum networks) ----
-    for net_key, docs_header in zkc_networks.items():
-        toml_net = toml_section(toml_data, net_key)
-        rs_addrs = extract_rs_addresses(povw_rs_content, zkc_rs_network_keys[net_key])
-
-        mapping = {
-            'zkc': 'zkc_address',
-            'vezkc': 'vezkc_address',
-            'povw-accounting': 'povw_accounting_address',
-            'povw-mint': 'povw_mint_address',
-        }
-
-        for toml_field, addr_field in mapping.items():
-            toml_addr = str(toml_net.get(toml_field, '') or '').lower()
-            rs_addr = str(rs_addrs.get(addr_field, '') or '').lower()
-
-            # Presence checks
-            if not toml_addr:
-                print(f"❌ Missing [deployment.{net_key}] {toml_field} in deployment.toml")
-                errors += 1
-            if not rs_addr:
-                print(f"❌ Missing [{net_key}] {addr_field} in crates/povw/src/deployments.rs")
-                errors += 1
-
-            # Mismatches
-            if toml_addr and rs_addr and toml_addr != rs_addr:
-                print(f"❌ Mismatch [{net_key}] {toml_field} between TOML and RS:")
-                print(f"  TOML: {toml_addr}")
-                print(f"  RS  : {rs_addr}")
-                errors += 1
+    povw_mapping = {
+        'zkc': 'zkc_address',
+        'vezkc': 'vezkc_address',
+        'povw-accounting': 'povw_accounting_address',
+        'povw-mint': 'povw_mint_address',
+    }
+    for net_key in zkc_networks:
+        errors += check_pairs(
+            net_key,
+            toml_section(toml_data, net_key),
+            povw_rs_parsed.get(zkc_rs_network_keys[net_key], {}),
+            povw_mapping,
+            'crates/povw/src/deployments.rs',
+            msgs,
+        )
 
     if errors == 0:
-        print("✅ All deployment addresses match across deployment.toml, deployments.rs, and documentation.")
+        msgs.append("✅ All deployment addresses match across deployment.toml, deployments.rs, and documentation.")
     else:
-        print(f"\n❌ Found {errors} issues. Please check inconsistencies or TODO placeholders.")
+        msgs.append(f"\n❌ Found {errors} issues. Please check inconsistencies or TODO placeholders.")
+
+    sys.stdout.write('\n'.join(msgs) + '\n')
+    if errors:
         sys.exit(1)
 
 